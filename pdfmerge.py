@@ -27,40 +27,129 @@
 # 2. BASIC PDF MERGER SCRIPT
 
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pypdf import PdfWriter, PdfReader
 from pathlib import Path
 
-def merge_pdfs(pdf_list, output_filename):
+# merge_pdfs parses at most this many files ahead of the one being appended
+_PREFETCH_READERS = 4
+# --low-memory merges open at most this many source PDFs at a time
+_PIKEPDF_BATCH = 64
+
+def _save_pikepdf_batch(pdf_files, output_filename, report=True):
+    """
+    Merge pdf_files into output_filename with pikepdf
+    
+    Sources stay open until the save (pikepdf copies their pages lazily)
+    and are all closed when it returns.
+    """
+    import pikepdf
+    from contextlib import ExitStack
+    
+    with ExitStack() as stack:
+        merged = stack.enter_context(pikepdf.Pdf.new())
+        for pdf_file in pdf_files:
+            src = stack.enter_context(pikepdf.open(pdf_file))
+            merged.pages.extend(src.pages)
+            if report:
+                print(f"Added {len(src.pages)} pages from {pdf_file}")
+        
+        merged.save(output_filename)
+
+def _merge_pdfs_pikepdf(pdf_list, output_filename):
+    """
+    Merge PDFs with pikepdf (QPDF)
+    
+    Pages are copied from the sources while saving, so memory stays bounded
+    instead of growing with every page added. At most _PIKEPDF_BATCH sources
+    are open at once: larger merges go through intermediate PDFs, so the
+    open-file limit is never reached.
+    """
+    import tempfile
+    
+    try:
+        existing = []
+        for pdf_file in pdf_list:
+            if not os.path.exists(pdf_file):
+                print(f"Warning: File {pdf_file} not found, skipping...")
+                continue
+            existing.append(pdf_file)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sources = existing
+            level = 0
+            while len(sources) > _PIKEPDF_BATCH:
+                parts = []
+                for start in range(0, len(sources), _PIKEPDF_BATCH):
+                    part = os.path.join(tmp_dir, f"level{level}_{len(parts)}.pdf")
+                    _save_pikepdf_batch(sources[start:start + _PIKEPDF_BATCH], part, report=level == 0)
+                    parts.append(part)
+                sources = parts
+                level += 1
+            
+            _save_pikepdf_batch(sources, output_filename, report=level == 0)
+        
+        print(f"Successfully merged {len(pdf_list)} PDFs into {output_filename}")
+        
+    except Exception as e:
+        print(f"Error merging PDFs: {str(e)}")
+
+def merge_pdfs(pdf_list, output_filename, low_memory=False):
     """
     Merge multiple PDF files into a single PDF
     
     Args:
-        pdf_list (list): List of PDF file paths to merge
+        pdf_list (list): List of PDF file paths (str or Path) to merge
         output_filename (str): Name of the output merged PDF file
+        low_memory (bool): Merge with pikepdf (QPDF) for bounded memory on very large merges
     """
+    if low_memory:
+        try:
+            import pikepdf  # noqa: F401
+        except ImportError:
+            print("Warning: pikepdf not installed, falling back to pypdf...")
+        else:
+            _merge_pdfs_pikepdf(pdf_list, output_filename)
+            return
+    
     # Create a PdfWriter object
     merger = PdfWriter()
     
     try:
-        # Loop through each PDF file
+        # Skip missing files up front
+        existing = []
         for pdf_file in pdf_list:
             if not os.path.exists(pdf_file):
                 print(f"Warning: File {pdf_file} not found, skipping...")
                 continue
+            existing.append(pdf_file)
+        
+        # Parse the next few files on worker threads while pages are appended.
+        # PdfWriter is not thread-safe: add pages serially, in input order.
+        # Each reader holds its whole file in memory, so only a small window
+        # of them is alive at once and each is released once appended.
+        with ThreadPoolExecutor(max_workers=_PREFETCH_READERS) as executor:
+            files = iter(existing)
+            pending = deque(
+                (pdf_file, executor.submit(PdfReader, pdf_file))
+                for pdf_file in islice(files, _PREFETCH_READERS)
+            )
+            while pending:
+                pdf_file, future = pending.popleft()
+                reader = future.result()
+                next_file = next(files, None)
+                if next_file is not None:
+                    pending.append((next_file, executor.submit(PdfReader, next_file)))
                 
-            # Open and read the PDF
-            with open(pdf_file, 'rb') as file:
-                reader = PdfReader(file)
-                
-                # Add all pages from the current PDF
-                for page_num in range(len(reader.pages)):
-                    page = reader.pages[page_num]
-                    merger.add_page(page)
+                merger.append_pages_from_reader(reader)
                 
                 print(f"Added {len(reader.pages)} pages from {pdf_file}")
+                del reader, future
         
-        # Write the merged PDF to output file
-        with open(output_filename, 'wb') as output_file:
+        # Write the merged PDF to output file (1 MiB buffer: fewer write syscalls)
+        with open(output_filename, 'wb', buffering=1 << 20) as output_file:
             merger.write(output_file)
         
         print(f"Successfully merged {len(pdf_list)} PDFs into {output_filename}")
@@ -74,7 +163,7 @@ def merge_pdfs(pdf_list, output_filename):
 
 # 3. ADVANCED PDF MERGER WITH FOLDER SCANNING
 
-def merge_pdfs_from_folder(folder_path, output_filename, file_pattern="*.pdf"):
+def merge_pdfs_from_folder(folder_path, output_filename, file_pattern="*.pdf", low_memory=False):
     """
     Merge all PDF files from a specific folder
     
@@ -82,6 +171,7 @@ def merge_pdfs_from_folder(folder_path, output_filename, file_pattern="*.pdf"):
         folder_path (str): Path to folder containing PDFs
         output_filename (str): Name of output merged PDF
         file_pattern (str): Pattern to match PDF files (default: "*.pdf")
+        low_memory (bool): Merge with pikepdf (QPDF) for bounded memory
     """
     folder = Path(folder_path)
     
@@ -89,24 +179,19 @@ def merge_pdfs_from_folder(folder_path, output_filename, file_pattern="*.pdf"):
         print(f"Error: Folder {folder_path} does not exist")
         return
     
-    # Get all PDF files in the folder
-    pdf_files = list(folder.glob(file_pattern))
+    # Get all PDF files in the folder, sorted alphabetically
+    pdf_files = sorted(folder.glob(file_pattern))
     
     if not pdf_files:
         print(f"No PDF files found in {folder_path}")
         return
     
-    # Sort files alphabetically
-    pdf_files.sort()
-    
-    # Convert to strings for the merge function
-    pdf_paths = [str(pdf) for pdf in pdf_files]
-    
     print(f"Found {len(pdf_files)} PDF files to merge:")
     for pdf in pdf_files:
         print(f"  - {pdf.name}")
     
-    merge_pdfs(pdf_paths, output_filename)
+    # merge_pdfs accepts Path objects directly
+    merge_pdfs(pdf_files, output_filename, low_memory=low_memory)
 
 # 4. PDF MERGER WITH SPECIFIC PAGE RANGES
 
@@ -137,6 +222,7 @@ def merge_pdfs_with_page_ranges(pdf_configs, output_filename):
                 print(f"Warning: File {pdf_file} not found, skipping...")
                 continue
             
+            # Read through an open handle: pypdf copies a path's whole file into memory
             with open(pdf_file, 'rb') as file:
                 reader = PdfReader(file)
                 total_pages = len(reader.pages)
@@ -149,16 +235,14 @@ def merge_pdfs_with_page_ranges(pdf_configs, output_filename):
                 start_page = max(0, min(start_page, total_pages - 1))
                 end_page = max(start_page, min(end_page, total_pages - 1))
                 
-                # Add specified pages
-                for page_num in range(start_page, end_page + 1):
-                    page = reader.pages[page_num]
-                    merger.add_page(page)
-                
-                pages_added = end_page - start_page + 1
-                print(f"Added pages {start_page}-{end_page} ({pages_added} pages) from {pdf_file}")
+                # Add specified pages (pages tuple is a slice: end is exclusive)
+                merger.append(reader, pages=(start_page, end_page + 1), import_outline=False)
+            
+            pages_added = end_page - start_page + 1
+            print(f"Added pages {start_page}-{end_page} ({pages_added} pages) from {pdf_file}")
         
         # Write merged PDF
-        with open(output_filename, 'wb') as output_file:
+        with open(output_filename, 'wb', buffering=1 << 20) as output_file:
             merger.write(output_file)
         
         print(f"Successfully created {output_filename}")
@@ -187,6 +271,9 @@ Examples:
   # Merge all PDFs in a folder
   python pdf_merger.py -d ./pdfs -o combined.pdf
   
+  # Merge a very large folder with bounded memory (pikepdf)
+  python pdf_merger.py -d ./pdfs -o combined.pdf --low-memory
+  
   # List PDFs in folder
   python pdf_merger.py -l ./pdfs
   
@@ -218,12 +305,17 @@ Examples:
                        help='File pattern for directory mode (default: *.pdf)')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='Enable verbose output')
+    parser.add_argument('--low-memory', action='store_true',
+                       help='Merge with pikepdf (QPDF) to keep memory bounded on very large merges')
     
     return parser
 
+# Built once at import so repeated programmatic main() calls reuse it
+_PARSER = create_parser()
+
 def main():
     """Main function to handle command line arguments"""
-    parser = create_parser()
+    parser = _PARSER
     args = parser.parse_args()
     
     try:
@@ -247,14 +339,14 @@ def main():
         if args.files:
             if args.verbose:
                 print(f"Merging {len(args.files)} files into {args.output}")
-            merge_pdfs(args.files, args.output)
+            merge_pdfs(args.files, args.output, low_memory=args.low_memory)
             return
         
         # Merge directory
         if args.directory:
             if args.verbose:
                 print(f"Merging PDFs from directory {args.directory}")
-            merge_pdfs_from_folder(args.directory, args.output, args.pattern)
+            merge_pdfs_from_folder(args.directory, args.output, args.pattern, low_memory=args.low_memory)
             return
         
         # Merge with page ranges
@@ -318,11 +410,13 @@ def get_pdf_info(pdf_path):
     try:
         with open(pdf_path, 'rb') as file:
             reader = PdfReader(file)
+            # reader.metadata re-reads the info dictionary on each access; bind it once
+            meta = reader.metadata or {}
             info = {
                 'filename': os.path.basename(pdf_path),
                 'pages': len(reader.pages),
-                'title': reader.metadata.get('/Title', 'Unknown') if reader.metadata else 'Unknown',
-                'author': reader.metadata.get('/Author', 'Unknown') if reader.metadata else 'Unknown'
+                'title': meta.get('/Title', 'Unknown'),
+                'author': meta.get('/Author', 'Unknown')
             }
             return info
     except Exception as e:
@@ -5,20 +5,57 @@ Run with .venv: python pdfocr.py -h
 """
 
 import argparse
+import functools
+import math
+import multiprocessing
 import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # PaddlePaddle 3.3+ CPU: disable OneDNN to avoid ConvertPirAttribute2RuntimeAttribute error
 os.environ["FLAGS_use_mkldnn"] = "0"
 
+_WS_RE = re.compile(r"\s+")
 
+# Minimum pages per worker before OCR text extraction is split across processes
+_TEXT_PAGES_PER_WORKER = 64
+
+# Tools whose PATH check already ran in this process; see _ensure_*_on_path
+_PATH_ENSURED: set[str] = set()
+# ocrmypdf ExitCode.already_done_ocr: input already has a text layer
+_EXIT_ALREADY_DONE_OCR = 6
+# ocrmypdf ExitCode.other_error: unexpected failure inside the OCR pipeline
+_EXIT_OTHER_ERROR = 15
+# Plain-dict copy of os.environ for the tool-discovery helpers; reset by _prepend_path
+_ENV_SNAPSHOT: dict[str, str] | None = None
+
+
+def _env() -> dict[str, str]:
+    """Return the environment snapshot, taking it on first use (os.environ lookups decode per call)."""
+    global _ENV_SNAPSHOT
+    if _ENV_SNAPSHOT is None:
+        _ENV_SNAPSHOT = dict(os.environ)
+    return _ENV_SNAPSHOT
+
+
+def _prepend_path(dirs: list[Path]) -> None:
+    """Prepend dirs to PATH and invalidate the environment snapshot."""
+    global _ENV_SNAPSHOT
+    extra = os.pathsep.join(str(p) for p in dirs)
+    os.environ["PATH"] = extra + os.pathsep + os.environ.get("PATH", "")
+    _ENV_SNAPSHOT = None
+
+
+@functools.lru_cache(maxsize=1)
 def _tesseract_candidate_paths() -> list[Path]:
     """Return paths where Tesseract might be installed (Windows)."""
+    env = _env()
     candidates: list[Path] = []
     # Env var: user can set TESSERACT_PATH or TESSERACT_OCR to install folder
     for name in ("TESSERACT_PATH", "TESSERACT_OCR"):
-        val = os.environ.get(name)
+        val = env.get(name)
         if val:
             p = Path(val).resolve()
             if p.is_dir():
@@ -35,8 +72,8 @@ def _tesseract_candidate_paths() -> list[Path]:
         except OSError:
             pass
     # Default Program Files locations
-    pf = os.environ.get("PROGRAMFILES", r"C:\Program Files")
-    pfx86 = os.environ.get("PROGRAMFILES(X86)", r"C:\Program Files (x86)")
+    pf = env.get("PROGRAMFILES", r"C:\Program Files")
+    pfx86 = env.get("PROGRAMFILES(X86)", r"C:\Program Files (x86)")
     candidates.extend([
         Path(pf) / "Tesseract-OCR",
         Path(pfx86) / "Tesseract-OCR",
@@ -45,7 +82,10 @@ def _tesseract_candidate_paths() -> list[Path]:
 
 
 def _ensure_tesseract_on_path() -> None:
-    """On Windows, if tesseract is not on PATH, prepend known install locations."""
+    """On Windows, if tesseract is not on PATH, prepend known install locations. Runs once per process."""
+    if "tesseract" in _PATH_ENSURED:
+        return
+    _PATH_ENSURED.add("tesseract")
     import shutil
     if shutil.which("tesseract"):
         return
@@ -53,16 +93,17 @@ def _ensure_tesseract_on_path() -> None:
         return
     candidates = _tesseract_candidate_paths()
     if candidates:
-        extra = os.pathsep.join(str(p) for p in candidates)
-        os.environ["PATH"] = extra + os.pathsep + os.environ.get("PATH", "")
+        _prepend_path(candidates)
 
 
+@functools.lru_cache(maxsize=1)
 def _ghostscript_candidate_paths() -> list[Path]:
     """Return bin paths where Ghostscript (gswin64c) might be (Windows)."""
+    env = _env()
     candidates: list[Path] = []
     # Env var: user can set GHOSTSCRIPT_PATH or GS_PATH to the 'bin' folder
     for name in ("GHOSTSCRIPT_PATH", "GS_PATH"):
-        val = os.environ.get(name)
+        val = env.get(name)
         if val:
             p = Path(val).resolve()
             if p.is_dir():
@@ -104,22 +145,30 @@ def _ghostscript_candidate_paths() -> list[Path]:
         pass
     # Program Files and common custom roots (gs/gs9.xx.x/bin)
     for root in (
-        Path(os.environ.get("PROGRAMFILES", r"C:\Program Files")) / "gs",
+        Path(env.get("PROGRAMFILES", r"C:\Program Files")) / "gs",
         Path(r"M:\ProgramFiles\gs"),
     ):
-        if not root.is_dir():
+        # One scandir pass (DirEntry.is_dir() uses the listing's cached file type), newest first
+        try:
+            with os.scandir(root) as it:
+                versions = sorted((e.path for e in it if e.is_dir()), reverse=True)
+        except OSError:
             continue
-        for bin_dir in sorted(root.glob("*/bin"), reverse=True):
-            if bin_dir.is_dir() and (
-                (bin_dir / "gswin64c.exe").exists() or (bin_dir / "gswin32c.exe").exists()
+        for version_dir in versions:
+            bin_dir = os.path.join(version_dir, "bin")
+            if os.path.exists(os.path.join(bin_dir, "gswin64c.exe")) or os.path.exists(
+                os.path.join(bin_dir, "gswin32c.exe")
             ):
-                candidates.append(bin_dir)
+                candidates.append(Path(bin_dir))
                 break
     return [p for p in candidates if p.exists()]
 
 
 def _ensure_ghostscript_on_path() -> None:
-    """On Windows, if gswin64c is not on PATH, prepend known install locations."""
+    """On Windows, if gswin64c is not on PATH, prepend known install locations. Runs once per process."""
+    if "ghostscript" in _PATH_ENSURED:
+        return
+    _PATH_ENSURED.add("ghostscript")
     import shutil
     gs_exe = "gswin64c" if sys.platform == "win32" else "gs"
     if shutil.which(gs_exe):
@@ -128,8 +177,7 @@ def _ensure_ghostscript_on_path() -> None:
         return
     candidates = _ghostscript_candidate_paths()
     if candidates:
-        extra = os.pathsep.join(str(p) for p in candidates)
-        os.environ["PATH"] = extra + os.pathsep + os.environ.get("PATH", "")
+        _prepend_path(candidates)
 
 
 def _run_ocrmypdf_cli(
@@ -147,6 +195,7 @@ def _run_ocrmypdf_cli(
     tagged_pdf_mode: str = "ignore",
     tesseract_psm: int | None = None,
     tesseract_config: str | None = None,
+    output_type: str = "auto",
 ) -> int:
     """Run ocrmypdf via subprocess (same as command line). Use when API path fails to produce searchable text."""
     import subprocess
@@ -176,6 +225,8 @@ def _run_ocrmypdf_cli(
         cmd.extend(["--tesseract-pagesegmode", str(tesseract_psm)])
     if tesseract_config:
         cmd.extend(["--tesseract-config", tesseract_config])
+    if output_type != "auto":
+        cmd.extend(["--output-type", output_type])
     result = subprocess.run(cmd, env=os.environ)
     return result.returncode
 
@@ -183,33 +234,146 @@ def _run_ocrmypdf_cli(
 def _pdf_has_searchable_text(
     pdf_path: Path, max_chars: int = 500, skip_if_pages_gt: int | None = 500
 ) -> tuple[str | None, bool]:
-    """Extract text from first page. Returns (snippet or None, skipped). Skip verification for very large PDFs (skipped=True) to avoid heavy I/O."""
+    """
+    Extract text from first page. Returns (snippet or None, skipped).
+    Uses pypdfium2 (loads only page 1, cost independent of page count) when available.
+    Otherwise pikepdf counts pages and pypdf reads page 1; very large PDFs are skipped (skipped=True).
+    """
     try:
-        from pypdf import PdfReader
-        reader = PdfReader(pdf_path)
-        n = len(reader.pages)
-        if n == 0:
-            return None, False
-        if skip_if_pages_gt is not None and n > skip_if_pages_gt:
-            return None, True  # skipped for large file
-        text = reader.pages[0].extract_text() or ""
-        text = " ".join(text.split())[:max_chars]
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+    try:
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            try:
+                if len(pdf) == 0:
+                    return None, False
+                page = pdf[0]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+            finally:
+                pdf.close()
+        else:
+            # Page count via pikepdf (installed with ocrmypdf): QPDF reads the xref lazily,
+            # so large files are skipped without a full pypdf parse
+            import pikepdf
+            with pikepdf.open(pdf_path) as pdf:
+                n = len(pdf.pages)
+            if n == 0:
+                return None, False
+            if skip_if_pages_gt is not None and n > skip_if_pages_gt:
+                return None, True  # skipped for large file
+            from pypdf import PdfReader
+            text = PdfReader(pdf_path).pages[0].extract_text() or ""
+        # Collapse whitespace in a bounded window only; page 1 can carry a large text layer
+        text = _WS_RE.sub(" ", text[: max_chars * 4]).strip()[:max_chars]
         return (text if text.strip() else None), False
     except Exception:
         return None, False
 
 
+def _is_already_searchable(pdf_path: Path) -> bool:
+    """True if page 1 already has a text layer (cheap check before launching ocrmypdf)."""
+    # Default window: a tiny one can hold only the leading whitespace/line breaks of page 1
+    text, _skipped = _pdf_has_searchable_text(pdf_path)
+    return text is not None
+
+
+def _fitz_chunk_texts(pdf_path: str, start: int, end: int) -> list[str]:
+    """Extract text of pages [start, end) with PyMuPDF (worker process: opens its own document)."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        return [doc[i].get_text("text") for i in range(start, end)]
+
+
+def _iter_page_texts(pdf_path: Path):
+    """
+    Yield the text of each page; PyMuPDF if installed (much faster), else pypdf.
+    Large documents are split into page chunks extracted in parallel worker processes.
+    """
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        from pypdf import PdfReader
+        for page in PdfReader(pdf_path).pages:
+            yield page.extract_text() or ""
+        return
+    with fitz.open(str(pdf_path)) as doc:
+        n_pages = doc.page_count
+        workers = min(os.cpu_count() or 1, 4, n_pages // _TEXT_PAGES_PER_WORKER)
+        if workers < 2:
+            for page in doc:
+                yield page.get_text("text")
+            return
+    size = -(-n_pages // workers)
+    starts = list(range(0, n_pages, size))
+    ends = [min(start + size, n_pages) for start in starts]
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+        for texts in ex.map(_fitz_chunk_texts, [str(pdf_path)] * len(starts), starts, ends):
+            yield from texts
+
+
 def _extract_text_to_file(pdf_path: Path, txt_path: Path) -> None:
     """Extract text from all pages of the OCR'd PDF and write to a .txt file (same dir as input, stem from input)."""
-    from pypdf import PdfReader
-    reader = PdfReader(pdf_path)
-    parts = []
-    for page in reader.pages:
-        parts.append(page.extract_text() or "")
-    txt_path.write_text("\n".join(parts), encoding="utf-8")
+    # Write page by page so only one page of text is held in memory
+    with open(txt_path, "w", encoding="utf-8") as out:
+        for n, text in enumerate(_iter_page_texts(pdf_path)):
+            if n:
+                out.write("\n")
+            out.write(text)
     print(f"Wrote extracted text to: {txt_path}", file=sys.stderr)
 
 
+def _parse_page_ranges(pages: str) -> list[int]:
+    """Parse a 1-based page spec like "1-3,5" (as for ocrmypdf --pages) into 0-based indices."""
+    page_indices: list[int] = []
+    for part in pages.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            a, b = part.split("-", 1)
+            page_indices.extend(range(int(a.strip()), int(b.strip()) + 1))
+        else:
+            page_indices.append(int(part))
+    return [p - 1 for p in page_indices]
+
+
+def _ocr_page_subset(input_file: Path, output_file: Path, page_indices: list[int], ocr) -> int:
+    """
+    OCR only the given 0-based pages: copy them into a temporary PDF, OCR that with
+    ocr(src, dst, None), then put the OCR'd pages back into a copy of the original (pikepdf).
+    """
+    import tempfile
+
+    import pikepdf
+
+    with tempfile.TemporaryDirectory() as tmp, pikepdf.open(input_file) as src:
+        n_pages = len(src.pages)
+        indices = sorted({i for i in page_indices if 0 <= i < n_pages})
+        if not indices:
+            print("Error: No valid pages in --pages.", file=sys.stderr)
+            return 1
+        subset_in = Path(tmp) / "pages.pdf"
+        subset_out = Path(tmp) / "pages_ocr.pdf"
+        with pikepdf.new() as subset:
+            subset.pages.extend(src.pages[i] for i in indices)
+            subset.save(subset_in)
+        result = ocr(subset_in, subset_out, None)
+        if result != 0:
+            return result
+        with pikepdf.open(subset_out) as done:
+            for j, i in enumerate(indices):
+                src.pages[i] = done.pages[j]
+            src.save(output_file)
+    return 0
+
+
 def _paddle_engine_available() -> str | None:
     """Return None if paddle deps are available, else an error message."""
     try:
@@ -279,18 +443,7 @@ def _run_ocr_paddle(
         return 1
 
     # Parse page range (1-based). None = all pages.
-    page_indices: list[int] | None = None
-    if pages:
-        # Simple "1-3" or "1,3,5" parsing
-        page_indices = []
-        for part in pages.split(","):
-            part = part.strip()
-            if "-" in part:
-                a, b = part.split("-", 1)
-                page_indices.extend(range(int(a.strip()), int(b.strip()) + 1))
-            else:
-                page_indices.append(int(part))
-        page_indices = [p - 1 for p in page_indices]  # 0-based
+    page_indices: list[int] | None = _parse_page_ranges(pages) if pages else None
 
     # Map language to PaddleOCR lang code
     lang_map = {"eng": "en", "en": "en", "fra": "fr", "fr": "fr", "chi": "ch", "ch": "ch"}
@@ -378,10 +531,11 @@ def run_ocr(
     tesseract_psm: int | None = None,
     tesseract_config: str | None = None,
     engine: str = "tesseract",
+    pdfa: bool | None = None,
 ) -> int:
     """
     Run OCR: add text layer to a PDF. Engine 'tesseract' (OCRmyPDF) or 'paddle' (PaddleOCR, better for handwriting).
-    Returns exit code: 0 on success, non-zero on failure.
+    Returns exit code: 0 on success, 6 if the input already has text (skipped), other non-zero on failure.
     """
     if engine == "paddle":
         return _run_ocr_paddle(
@@ -428,6 +582,15 @@ def run_ocr(
     if force_ocr and redo_ocr:
         redo_ocr = False  # force_ocr takes precedence
 
+    # ocrmypdf refuses PDFs that already have text unless forced, but only after starting its
+    # pipeline; detect that up front and skip (same exit code as ocrmypdf's already_done_ocr)
+    if not force_ocr and not redo_ocr and not pages and _is_already_searchable(input_file):
+        print(
+            f"Skipped: {input_file.name} already has a text layer. Use --force-ocr or --force-overwrite to re-OCR.",
+            file=sys.stderr,
+        )
+        return _EXIT_ALREADY_DONE_OCR
+
     # Image optimization (needs Ghostscript). Default: 1 if GS available, else 0.
     gs_exe = "gswin64c" if sys.platform == "win32" else "gs"
     gs_available = bool(shutil.which(gs_exe))
@@ -446,13 +609,18 @@ def run_ocr(
         print("Note: pngquant not found; --optimize 2/3 requires it. Using --optimize 1. Install with: choco install pngquant", file=sys.stderr)
         optimize_level = 1
 
-    # output_type='auto': try PDF/A without Ghostscript; fallback keeps OCR text layer
+    # output_type='auto': try PDF/A without Ghostscript; fallback keeps OCR text layer.
+    # PDF/A conversion is a single-core Ghostscript pass; skip it (output_type='pdf') unless
+    # asked for. Default: PDF/A only when optimizing (optimize 0 means speed over size/archival).
+    if pdfa is None:
+        pdfa = optimize_level >= 1
+    output_type = "auto" if pdfa else "pdf"
     # fpdf2 renderer is OCRmyPDF's main path and most reliable for searchable text
     tagged_mode = getattr(TaggedPdfMode, tagged_pdf_mode, TaggedPdfMode.ignore)
     options = OcrOptions(
         input_file=input_file,
         output_file=output_file,
-        output_type="auto",
+        output_type=output_type,
         pdf_renderer=pdf_renderer,
         deskew=deskew,
         languages=languages,
@@ -473,54 +641,78 @@ def run_ocr(
     if update:
         options = options.model_copy(update=update)
 
-    if use_cli:
-        result = _run_ocrmypdf_cli(
-            input_file,
-            output_file,
-            deskew=deskew,
-            language=language,
-            force_ocr=force_ocr,
-            redo_ocr=redo_ocr,
-            optimize_level=optimize_level,
-            progress_bar=progress_bar,
-            jobs=jobs,
-            pages=pages,
-            tagged_pdf_mode=tagged_pdf_mode,
-            tesseract_psm=tesseract_psm,
-            tesseract_config=tesseract_config,
-        )
-    else:
-        try:
-            result = ocrmypdf.ocr(options)
-        except ocrmypdf.exceptions.PriorOcrFoundError:
-            print("Error: PDF already has a text layer. Use --force-overwrite to re-OCR.", file=sys.stderr)
-            return 1
-        except ocrmypdf.exceptions.MissingDependencyError as e:
-            err = str(e)
-            print(f"Error: {e}", file=sys.stderr)
-            if "gswin64c" in err or "ghostscript" in err.lower():
-                print(
-                    "Ghostscript is required for image optimization. Either:\n"
-                    "  1. Install from https://ghostscript.com/releases/gsdnld.html\n"
-                    "     (e.g. default: C:\\Program Files\\gs\\gs10.x.x\\bin), or\n"
-                    "  2. Set GHOSTSCRIPT_PATH to the Ghostscript 'bin' folder, e.g.:\n"
-                    "     $env:GHOSTSCRIPT_PATH = \"M:\\ProgramFiles\\gs\\gs10.02.1\\bin\"",
-                    file=sys.stderr,
-                )
-            else:
-                print(
-                    "Tesseract is required. Either:\n"
-                    "  1. Install from https://github.com/UB-Mannheim/tesseract/wiki\n"
-                    "     (use default path so this script can find it), or\n"
-                    "  2. Add its folder to system PATH, or\n"
-                    "  3. Set TESSERACT_PATH to the install folder, e.g.:\n"
-                    "     $env:TESSERACT_PATH = \"C:\\Program Files\\Tesseract-OCR\"",
-                    file=sys.stderr,
+    def _ocr(src: Path, dst: Path, page_arg: str | None) -> int:
+        """Run ocrmypdf (CLI or API) on src -> dst; returns its exit code."""
+        if use_cli:
+            return _run_ocrmypdf_cli(
+                src,
+                dst,
+                deskew=deskew,
+                language=language,
+                force_ocr=force_ocr,
+                redo_ocr=redo_ocr,
+                optimize_level=optimize_level,
+                progress_bar=progress_bar,
+                jobs=jobs,
+                pages=page_arg,
+                tagged_pdf_mode=tagged_pdf_mode,
+                tesseract_psm=tesseract_psm,
+                tesseract_config=tesseract_config,
+                output_type=output_type,
+            )
+        else:
+            try:
+                return ocrmypdf.ocr(
+                    options.model_copy(update={"input_file": src, "output_file": dst, "pages": page_arg})
                 )
-            return 1
+            except ocrmypdf.exceptions.PriorOcrFoundError:
+                print("Error: PDF already has a text layer. Use --force-overwrite to re-OCR.", file=sys.stderr)
+                return 1
+            except ocrmypdf.exceptions.MissingDependencyError as e:
+                err = str(e)
+                print(f"Error: {e}", file=sys.stderr)
+                if "gswin64c" in err or "ghostscript" in err.lower():
+                    print(
+                        "Ghostscript is required for image optimization. Either:\n"
+                        "  1. Install from https://ghostscript.com/releases/gsdnld.html\n"
+                        "     (e.g. default: C:\\Program Files\\gs\\gs10.x.x\\bin), or\n"
+                        "  2. Set GHOSTSCRIPT_PATH to the Ghostscript 'bin' folder, e.g.:\n"
+                        "     $env:GHOSTSCRIPT_PATH = \"M:\\ProgramFiles\\gs\\gs10.02.1\\bin\"",
+                        file=sys.stderr,
+                    )
+                else:
+                    print(
+                        "Tesseract is required. Either:\n"
+                        "  1. Install from https://github.com/UB-Mannheim/tesseract/wiki\n"
+                        "     (use default path so this script can find it), or\n"
+                        "  2. Add its folder to system PATH, or\n"
+                        "  3. Set TESSERACT_PATH to the install folder, e.g.:\n"
+                        "     $env:TESSERACT_PATH = \"C:\\Program Files\\Tesseract-OCR\"",
+                        file=sys.stderr,
+                    )
+                return 1
+            except ocrmypdf.exceptions.ExitCodeException as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return int(e.exit_code)
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return _EXIT_OTHER_ERROR
+
+    # Sparse --pages with --force-ocr: OCR a small PDF of just those pages instead of
+    # letting ocrmypdf read and rewrite every page. Not with optimization, which needs the full file,
+    # nor with PDF/A: the pages are grafted into a plain save of the original.
+    try:
+        page_indices = _parse_page_ranges(pages) if pages else None
+    except ValueError:
+        page_indices = None  # malformed spec: let ocrmypdf report it
+    if page_indices and force_ocr and optimize_level == 0 and not pdfa:
+        try:
+            result = _ocr_page_subset(input_file, output_file, page_indices, _ocr)
         except Exception as e:
             print(f"Error: {e}", file=sys.stderr)
             return 1
+    else:
+        result = _ocr(input_file, output_file, pages)
 
     if result == 0:
         print(f"Wrote searchable PDF to: {output_file}", file=sys.stderr)
@@ -548,6 +740,168 @@ def run_ocr(
     return result
 
 
+def _ocr_batch_worker(kwargs: dict) -> int:
+    """
+    Batch worker: OCR one file with the mode chosen by use_cli. If the in-process ocrmypdf API
+    fails inside OCR (not on bad arguments or input, exit code 1) or, for a whole-file run, its
+    output has no detectable text layer, retry via the CLI.
+    """
+    code = run_ocr(**kwargs)
+    if kwargs["use_cli"] or code in (1, _EXIT_ALREADY_DONE_OCR):
+        return code
+    if code == 0:
+        if kwargs.get("pages"):
+            return code  # page 1 may be outside the OCR'd range
+        sample, skipped = _pdf_has_searchable_text(Path(kwargs["output_path"]))
+        if sample or skipped:
+            return code
+    print(f"Retrying with ocrmypdf CLI: {kwargs['input_path']}", file=sys.stderr)
+    return run_ocr(**dict(kwargs, use_cli=True))
+
+
+def _report_text_error(fut) -> None:
+    """Done-callback for background text extraction: report failures."""
+    exc = fut.exception()
+    if exc is not None:
+        print(f"Error extracting text: {exc}", file=sys.stderr)
+
+
+def _expand_inputs(inputs: list[str]) -> list[Path]:
+    """
+    Resolve input paths, expanding glob patterns (Windows shells do not expand them).
+    An existing file is taken literally even if its name contains [, * or ?. Like -d,
+    glob matches skip our own *_ext.pdf outputs.
+    """
+    import glob
+
+    files: list[Path] = []
+    for item in inputs:
+        if os.path.exists(item) or not glob.has_magic(item):
+            files.append(Path(item).resolve())
+            continue
+        files.extend(
+            Path(m).resolve()
+            for m in sorted(glob.glob(item))
+            if not Path(m).stem.endswith("_ext")
+        )
+    return files
+
+
+def _run_batch(pdf_files: list[Path], args: argparse.Namespace) -> int:
+    """
+    OCR several PDFs, each to <name>_ext.pdf in its own dir. Returns exit code.
+    Tesseract files run in parallel worker processes (with --no-use-cli the ocrmypdf API runs
+    in-process, so the interpreter/import cost is paid once per worker rather than once per file).
+    """
+    if args.engine == "paddle":
+        missing = _paddle_engine_available()
+        if missing:
+            print(
+                f"PaddleOCR engine requires '{missing}'. Install the optional dependency:\n"
+                "  pip install 'doctools[paddle]'",
+                file=sys.stderr,
+            )
+            return 1
+    common = dict(
+        deskew=not args.no_deskew,
+        language=args.language,
+        jobs=args.jobs,
+        progress_bar=not args.no_progress,
+        redo_ocr=args.force_overwrite,
+        force_ocr=args.force_ocr,
+        pdf_renderer=args.renderer,
+        pages=args.pages,
+        optimize=args.optimize,
+        save_text=args.save_text,
+        tagged_pdf_mode=args.tagged_pdf_mode,
+        tesseract_psm=args.tesseract_psm,
+        tesseract_config=args.tesseract_config,
+        engine=args.engine,
+        pdfa=args.pdfa,
+    )
+    tasks = [
+        (pdf_path, pdf_path.parent / f"{pdf_path.stem}_ext.pdf") for pdf_path in pdf_files
+    ]
+    # Default: sqrt(cpu) files at a time, each with sqrt(cpu) ocrmypdf jobs
+    cpu = os.cpu_count() or 1
+    default_parallel = max(1, int(math.sqrt(cpu)))
+    workers = min(len(pdf_files), args.parallel_files or default_parallel)
+    # -T: extract text on a background thread, overlapping with the next file's OCR.
+    # One thread only: PyMuPDF must not be used from several threads at once. The paddle
+    # engine runs PyMuPDF on this thread itself, so its text is extracted inline instead.
+    common["save_text"] = False
+    text_pool = ThreadPoolExecutor(max_workers=1)
+
+    def _ocr_done(pdf_path: Path, out_path: Path, code: int) -> None:
+        if code != 0 or not args.save_text:
+            return
+        txt_path = pdf_path.parent / f"{pdf_path.stem}.txt"
+        if args.engine == "paddle":
+            try:
+                _extract_text_to_file(out_path, txt_path)
+            except Exception as e:
+                print(f"Error extracting text: {e}", file=sys.stderr)
+        else:
+            fut = text_pool.submit(_extract_text_to_file, out_path, txt_path)
+            fut.add_done_callback(_report_text_error)
+
+    failed = skipped = 0
+    with text_pool:
+        if args.engine == "tesseract" and workers > 1:
+            common["jobs"] = args.jobs or default_parallel
+            if workers * common["jobs"] > 2 * cpu:
+                print(
+                    f"Warning: {workers} parallel files x {common['jobs']} jobs each oversubscribes "
+                    f"{cpu} CPUs; lower --parallel-files or --jobs-per-file.",
+                    file=sys.stderr,
+                )
+            common["progress_bar"] = False  # progress bars from several processes interleave
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+                futures = {}
+                for pdf_path, out_path in tasks:
+                    print(f"OCR: {pdf_path} -> {out_path}", file=sys.stderr)
+                    kwargs = dict(
+                        common,
+                        input_path=str(pdf_path),
+                        output_path=str(out_path),
+                        use_cli=args.use_cli,
+                    )
+                    futures[ex.submit(_ocr_batch_worker, kwargs)] = (pdf_path, out_path)
+                for fut in as_completed(futures):
+                    try:
+                        code = fut.result()
+                    except Exception as e:
+                        print(f"Error: {futures[fut][0]}: {e}", file=sys.stderr)
+                        code = 1
+                    if code == _EXIT_ALREADY_DONE_OCR:
+                        skipped += 1
+                    elif code != 0:
+                        failed += 1
+                    _ocr_done(*futures[fut], code)
+        else:
+            for pdf_path, out_path in tasks:
+                print(f"OCR: {pdf_path} -> {out_path}", file=sys.stderr)
+                code = run_ocr(
+                    input_path=str(pdf_path),
+                    output_path=str(out_path),
+                    use_cli=args.use_cli,
+                    **common,
+                )
+                if code == _EXIT_ALREADY_DONE_OCR:
+                    skipped += 1
+                elif code != 0:
+                    failed += 1
+                _ocr_done(pdf_path, out_path, code)
+    done = len(pdf_files) - failed - skipped
+    print(
+        f"Processed {done}/{len(pdf_files)} file(s)"
+        + (f", skipped {skipped} already searchable." if skipped else "."),
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Deskew and OCR scanned PDFs. Produces a searchable PDF. Requires Tesseract.",
@@ -559,23 +913,31 @@ Examples:
   python pdfocr.py -i scanned.pdf -T             # also write scanned.txt (OCR text)
   python pdfocr.py -i scanned.pdf -o out.pdf --no-deskew
   python pdfocr.py -i scanned.pdf -o out.pdf -l eng+fra
+  python pdfocr.py -i a.pdf b.pdf "scans/*.pdf" # several inputs in parallel -> <name>_ext.pdf
   python pdfocr.py -d ./pdfs                     # OCR each PDF in dir -> <name>_ext.pdf
   python pdfocr.py -d ./pdfs -r -T              # recursive, and save .txt per file
   python pdfocr.py -i form.pdf -O -hw         # better for handwritten fill-in (PSM 11)
   python pdfocr.py -i form.pdf -O --engine paddle   # PaddleOCR (detection+recognition, good for handwriting)
         """,
     )
-    parser.add_argument("-i", "--input", help="Input PDF (scanned/image PDF). Required unless -d is used.")
-    parser.add_argument("-o", "--output", default="ocr_output.pdf", help="Output searchable PDF (default: ocr_output.pdf; ignored with -d)")
+    parser.add_argument("-i", "--input", nargs="+", help="Input PDF(s) (scanned/image PDF); glob patterns allowed. Several inputs are OCR'd in parallel to <name>_ext.pdf. Required unless -d is used.")
+    parser.add_argument("-o", "--output", default="ocr_output.pdf", help="Output searchable PDF (default: ocr_output.pdf; ignored with -d or several inputs)")
     parser.add_argument("-d", "--directory", metavar="DIR", help="OCR each PDF in DIR; output <name>_ext.pdf in same dir. Skips *_ext.pdf (already processed).")
     parser.add_argument("-r", "--recursive", action="store_true", help="With -d: process subdirectories recursively")
     parser.add_argument("-O", "--output-same-dir", dest="output_same_dir", action="store_true", help="Save output in same dir as input, filename <name>_ext.pdf (default when using -d)")
     parser.add_argument("-T", "--text", dest="save_text", action="store_true", help="Save extracted text to <input_stem>.txt in same dir as input")
     parser.add_argument("--no-deskew", action="store_true", help="Disable deskew (deskew is on by default)")
     parser.add_argument("-l", "--language", default="eng", help="Language: eng, fra, ch, etc. (default: eng)")
-    parser.add_argument("-j", "--jobs", type=int, default=None, help="Max parallel jobs (default: auto). Lower this for 1000+ page PDFs if you run out of memory.")
+    parser.add_argument("-j", "--jobs", "--jobs-per-file", dest="jobs", type=int, default=None, help="ocrmypdf parallel jobs per file (default: all CPUs for one file, sqrt(CPUs) per file when OCRing several in parallel). Lower this for 1000+ page PDFs if you run out of memory.")
+    parser.add_argument("--parallel-files", type=int, default=None, metavar="N", help="With -d or several -i inputs: OCR N files at once (default: sqrt(CPUs); 1 = one at a time). Keep N x jobs-per-file near the CPU count.")
     parser.add_argument("-p", "--pages", type=str, default=None, metavar="RANGES", help="OCR only these pages: e.g. 1-10, 1,3,5, 20-25 (1-based). Other pages are copied unchanged.")
     parser.add_argument("--optimize", type=int, default=None, choices=[0, 1, 2, 3], metavar="N", help="Image optimization 0-3 (default: 1 if Ghostscript found). 2-3 need pngquant (e.g. choco install pngquant).")
+    parser.add_argument(
+        "--pdfa",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Write PDF/A (--pdfa) or plain PDF (--no-pdfa). PDF/A needs a single-core Ghostscript pass, often slower than the OCR itself. Default: PDF/A only with --optimize 1+.",
+    )
     parser.add_argument("--no-progress", action="store_true", help="Disable progress bar")
     parser.add_argument("--force-overwrite", action="store_true", help="Re-OCR: remove existing OCR layer and run again (deskew disabled for this mode)")
     parser.add_argument(
@@ -647,53 +1009,25 @@ Examples:
         if not pdf_files:
             print(f"No PDF files found in {args.directory}", file=sys.stderr)
             sys.exit(1)
-        if args.engine == "paddle":
-            missing = _paddle_engine_available()
-            if missing:
-                print(
-                    f"PaddleOCR engine requires '{missing}'. Install the optional dependency:\n"
-                    "  pip install 'doctools[paddle]'",
-                    file=sys.stderr,
-                )
-                sys.exit(1)
-        failed = 0
-        for pdf_path in pdf_files:
-            out_path = pdf_path.parent / f"{pdf_path.stem}_ext.pdf"
-            print(f"OCR: {pdf_path} -> {out_path}", file=sys.stderr)
-            code = run_ocr(
-                input_path=str(pdf_path),
-                output_path=str(out_path),
-                deskew=not args.no_deskew,
-                language=args.language,
-                jobs=args.jobs,
-                progress_bar=not args.no_progress,
-                redo_ocr=args.force_overwrite,
-                force_ocr=args.force_ocr,
-                pdf_renderer=args.renderer,
-                use_cli=args.use_cli,
-                pages=args.pages,
-                optimize=args.optimize,
-                save_text=args.save_text,
-                tagged_pdf_mode=args.tagged_pdf_mode,
-                tesseract_psm=args.tesseract_psm,
-                tesseract_config=args.tesseract_config,
-                engine=args.engine,
-            )
-            if code != 0:
-                failed += 1
-        print(f"Processed {len(pdf_files) - failed}/{len(pdf_files)} file(s).", file=sys.stderr)
-        sys.exit(1 if failed else 0)
+        sys.exit(_run_batch(pdf_files, args))
     else:
         if not args.input:
             parser.error("Either -i/--input or -d/--directory is required")
+        input_files = _expand_inputs(args.input)
+        if not input_files:
+            print(f"No PDF files match: {' '.join(args.input)}", file=sys.stderr)
+            sys.exit(1)
+        if len(input_files) > 1:
+            sys.exit(_run_batch(input_files, args))
+        input_path = str(input_files[0])
         if args.output_same_dir:
-            inp = Path(args.input).resolve()
+            inp = input_files[0]
             output_path = str(inp.parent / f"{inp.stem}_ext.pdf")
         else:
             output_path = args.output
 
         exit_code = run_ocr(
-            input_path=args.input,
+            input_path=input_path,
             output_path=output_path,
             deskew=not args.no_deskew,
             language=args.language,
@@ -710,6 +1044,7 @@ Examples:
             tesseract_psm=args.tesseract_psm,
             tesseract_config=args.tesseract_config,
             engine=args.engine,
+            pdfa=args.pdfa,
         )
         sys.exit(exit_code)
 
@@ -4,56 +4,202 @@ Document can be a .txt file or .json from pdfextract -t out.json.
 Requires OPENAI_API_KEY in the environment.
 """
 
-import argparse
-import json
+import functools
 import os
 import re
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 
+# System prompts: constants so the prompt prefix is identical on every call (prompt caching)
+_META_SYSTEM = (
+    "You are a precise assistant. Extract metadata from the document. "
+    "Return ONLY a valid JSON object with exactly these keys (use null if not found): "
+    '"title" (document title), "date_time" (document date/time as found in the text), '
+    '"summary" (exactly one short sentence summarizing the document). No other text.'
+)
+_ASK_SYSTEM = (
+    "You are a helpful assistant. Answer the user's question based only on the provided document. "
+    "If the document does not contain enough information, say so. Keep answers concise."
+)
+
+# Title/date/summary only need the start of the document: cap the meta prompt at this many tokens
+_META_MAX_TOKENS = 8000
+# --map-reduce: documents above this many tokens are answered per chunk, then combined
+_MAP_REDUCE_THRESHOLD = 8000
+_CHUNK_TOKENS = 4000
+_CHUNK_OVERLAP = 200
+# --retrieve: documents above this many tokens are cut down to the passages closest to the question
+_RETRIEVE_THRESHOLD = 6000
+_EMBED_MODEL = "text-embedding-3-small"
+# Inputs per embeddings request: 512 x 512-token chunks stays under the API's 300k tokens/request
+_EMBED_BATCH = 512
+# retrieve() keeps each document's chunks (<key>.json) and embeddings (<key>.npy) here
+_EMBED_CACHE_DIR = Path.home() / ".sumai_cache"
+# --auto-model: short factual questions go to this cheaper, faster model
+_SIMPLE_MODEL = "gpt-4.1-nano"
+_RE_SIMPLE_QUESTION = re.compile(r"\b(?:how many|what is the title|date|author)\b")
+# ask_openai answer cache: (document, question, model) -> answer; disable with --no-cache
+_CACHE_DB = Path.home() / ".sumai_cache.sqlite"
+# At most this many OpenAI requests in flight at once, across questions, map-reduce chunks and
+# embedding batches (each runs in its own thread pool)
+_API_SLOTS = threading.BoundedSemaphore(8)
+
+# canonical_doc_filename patterns, compiled once
+_RE_ISO_DATE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_RE_YEAR = re.compile(r"(\d{4})")
+_RE_NONWORD = re.compile(r"[^\w\s-]")
+_RE_SEP = re.compile(r"[-\s]+")
+# First non-whitespace byte of a JSON file
+_RE_NONSPACE_B = re.compile(rb"\S")
+
+
+def _parse_date(s: str) -> str | None:
+    """Return YYYY-mm-dd from a free-form date string, or None. Picks the format by cheap character checks."""
+    m = _RE_ISO_DATE.search(s)
+    if m:
+        return f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}"
+    token = s.split(None, 1)[0]
+    if "/" in token:
+        formats: tuple[str, ...] = ("%m/%d/%Y",)
+        candidate = token
+    elif "." in token:
+        formats = ("%d.%m.%Y",)
+        candidate = token
+    elif s[0].isalpha():
+        formats = ("%B %d, %Y", "%b %d, %Y")
+        candidate = s
+    else:
+        formats = ("%d %B %Y", "%d %b %Y")
+        candidate = s
+    for fmt in formats:
+        try:
+            return datetime.strptime(candidate, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    # Fall back to the year alone
+    m = _RE_YEAR.search(s)
+    if m:
+        return f"{m.group(1)}-01-01"
+    return None
+
 
 def canonical_doc_filename(
     date_time: str | None, title: str | None, extension: str = ".json"
 ) -> str:
     """Build canonical document filename: YYYY-mm-dd_Document-title with words hyphenated."""
-    # Date part: try to get YYYY-mm-dd from date_time, else today
-    date_part = "0000-00-00"
+    # Date part: YYYY-mm-dd from date_time, else today
+    date_part = None
     if date_time and date_time.strip():
-        s = date_time.strip()
-        # Try ISO-style first
-        m = re.search(r"(\d{4})-(\d{1,2})-(\d{1,2})", s)
-        if m:
-            y, mo, d = m.group(1), m.group(2).zfill(2), m.group(3).zfill(2)
-            date_part = f"{y}-{mo}-{d}"
-        else:
-            # Try (MM/)DD/YYYY or DD.MM.YYYY etc.
-            m = re.search(r"(\d{4})", s)
-            if m:
-                date_part = f"{m.group(1)}-01-01"
-            else:
-                try:
-                    for fmt in ("%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%m/%d/%Y", "%d.%m.%Y"):
-                        try:
-                            dt = datetime.strptime(s[:50], fmt)
-                            date_part = dt.strftime("%Y-%m-%d")
-                            break
-                        except ValueError:
-                            continue
-                except Exception:
-                    pass
-    if date_part == "0000-00-00":
+        date_part = _parse_date(date_time.strip())
+    if date_part is None:
         date_part = datetime.now().strftime("%Y-%m-%d")
     # Title part: hyphenate words, alphanumeric and hyphens only
     if title and title.strip():
-        word = re.sub(r"[^\w\s-]", "", title.strip())
-        word = re.sub(r"[-\s]+", "-", word).strip("-")
+        word = _RE_NONWORD.sub("", title.strip())
+        word = _RE_SEP.sub("-", word).strip("-")
         title_part = word or "Untitled"
     else:
         title_part = "Untitled"
     return f"{date_part}_{title_part}{extension}"
 
 
+def _loads(data: bytes | str):
+    """Parse JSON; orjson when installed (several times faster than json), else json."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. integers beyond 64 bits, which json accepts
+    import json
+
+    return json.loads(data)
+
+
+def _dumps(obj) -> str:
+    """Serialize to JSON text, non-ASCII kept; orjson when installed, else json."""
+    try:
+        import orjson
+    except ImportError:
+        import json
+
+        return json.dumps(obj, ensure_ascii=False)
+    return orjson.dumps(obj).decode()
+
+
+def _stream_page_texts(path: Path) -> list[str] | None:
+    """
+    Stream page texts from pdfextract JSON ({"pages": [{"text": ...}, ...]}) with ijson over a
+    memory-mapped file, holding one page object at a time. Returns None if ijson is not installed,
+    the top level is not an object, or no pages were found.
+    """
+    try:
+        import ijson
+    except ImportError:
+        return None
+    try:
+        # C (yajl2_c) backend when built; the pure-Python default is several times slower
+        items = ijson.get_backend("yajl2_c").items
+    except ImportError:
+        items = ijson.items
+    import mmap
+
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+        with mm:
+            # Only a top-level object can hold "pages"; skip the streaming pass for lists etc.
+            first = _RE_NONSPACE_B.search(mm)
+            if first is None or first.group() != b"{":
+                return None
+            texts = [p.get("text") or "" for p in items(mm, "pages.item")]
+    return texts or None
+
+
+@functools.lru_cache(maxsize=1)
+def _json_parser():
+    """Reusable pysimdjson parser (keeps its buffers between parses), or None if not installed."""
+    try:
+        import simdjson
+    except ImportError:
+        return None
+    return simdjson.Parser()
+
+
+def _simdjson_load(parser, raw: bytes):
+    """
+    Parse raw JSON with simdjson. Returns (page texts, None) for pdfextract JSON, projecting only
+    each page's "text" field into Python; (None, list) for a top-level array; else (None, None).
+    """
+    import simdjson
+
+    doc = parser.parse(raw)
+    if isinstance(doc, simdjson.Object) and "pages" in doc:
+        texts = []
+        for p in doc["pages"]:
+            try:
+                texts.append(p["text"] or "")
+            except KeyError:
+                texts.append("")
+        return texts, None
+    if isinstance(doc, simdjson.Array):
+        return None, doc.as_list()
+    # Any other shape is passed through as the raw file text: nothing to convert
+    return None, None
+
+
+def _join_pages(pages: list[dict]) -> str:
+    """Join the "text" of each pdfextract page with blank lines; missing or null text counts as empty."""
+    return "\n\n".join([p.get("text") or "" for p in pages]).strip()
+
+
 def load_document(path: Path) -> str:
     """Load document text from .txt or .json (pdfextract -t output)."""
     path = Path(path)
@@ -61,77 +207,458 @@ def load_document(path: Path) -> str:
         raise FileNotFoundError(f"Document not found: {path}")
     suffix = path.suffix.lower()
     if suffix == ".json":
-        data = json.loads(path.read_text(encoding="utf-8"))
+        raw = None
+        parser = _json_parser()
+        if parser is not None:
+            raw = path.read_bytes()
+            texts, data = _simdjson_load(parser, raw)
+        else:
+            texts = _stream_page_texts(path)
+            if texts is None:
+                raw = path.read_bytes()
+                data = _loads(raw)
+        if texts is not None:
+            return "\n\n".join(texts).strip()
         if isinstance(data, dict) and "pages" in data:
-            return "\n\n".join(
-                p.get("text", "") for p in data["pages"]
-            ).strip()
+            return _join_pages(data["pages"])
+        # str.join sizes the result from a list in one pass (a generator is copied into one first)
         if isinstance(data, list):
             return "\n\n".join(
-                p.get("text", p) if isinstance(p, dict) else str(p) for p in data
+                [p.get("text", p) if isinstance(p, dict) else str(p) for p in data]
             ).strip()
-        return json.dumps(data, ensure_ascii=False)
-    # .txt or any other: read as plain text
-    return path.read_text(encoding="utf-8").strip()
+        # Unknown shape: the file is already JSON text, so pass it through instead of re-serializing
+        return raw.decode("utf-8-sig", "replace").strip()
+    # .txt or any other: decode straight from the mapped file (no intermediate bytes copy)
+    import mmap
+
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return ""
+        with mm:
+            return str(mm, "utf-8").strip()
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding(model: str):
+    """tiktoken encoding for model (o200k_base if unknown), or None if tiktoken is not installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _truncate_tokens(text: str, max_tokens: int, model: str) -> str:
+    """Cut text to at most max_tokens tokens for model; without tiktoken, ~4 characters per token."""
+    enc = _encoding(model)
+    if enc is None:
+        return text[: max_tokens * 4]
+    # Only encode a prefix: max_tokens tokens rarely span more than 8 characters each
+    head = text[: max_tokens * 8]
+    tokens = enc.encode(head)
+    if len(tokens) <= max_tokens:
+        return head
+    return enc.decode(tokens[:max_tokens])
+
+
+def _encode(text: str, model: str) -> list[int] | None:
+    """Token ids of text for model, or None without tiktoken."""
+    enc = _encoding(model)
+    return None if enc is None else enc.encode(text)
+
+
+def _count_tokens(text: str, model: str, tokens: list[int] | None = None) -> int:
+    """
+    Number of tokens in text for model; without tiktoken, ~4 characters per token.
+    tokens: text already encoded with _encode, to skip encoding it again.
+    """
+    if tokens is not None:
+        return len(tokens)
+    enc = _encoding(model)
+    if enc is None:
+        return len(text) // 4
+    return len(enc.encode(text))
+
+
+def _split_tokens(
+    text: str, chunk_tokens: int, overlap: int, model: str, tokens: list[int] | None = None
+) -> list[str]:
+    """
+    Split text into chunks of chunk_tokens tokens, consecutive chunks sharing overlap tokens.
+    tokens: text already encoded with _encode, to skip encoding it again.
+    """
+    step = chunk_tokens - overlap
+    enc = _encoding(model)
+    if enc is None:
+        # ~4 characters per token
+        return [
+            text[i : i + chunk_tokens * 4]
+            for i in range(0, max(len(text) - overlap * 4, 1), step * 4)
+        ]
+    if tokens is None:
+        tokens = enc.encode(text)
+    return [
+        enc.decode(tokens[i : i + chunk_tokens])
+        for i in range(0, max(len(tokens) - overlap, 1), step)
+    ]
+
+
+def _pick_model(question: str, model: str) -> str:
+    """_SIMPLE_MODEL for short lookup-style questions (title, date, author, counts), else model."""
+    # Whole words only: "date" must not match "update" or "candidate"
+    if len(question) < 80 and _RE_SIMPLE_QUESTION.search(question.lower()):
+        return _SIMPLE_MODEL
+    return model
+
+
+def _doc_hash(*parts: str) -> str:
+    """
+    128-bit hex digest of the NUL-separated parts (hashed incrementally; no joined copy).
+    xxh3_128 when xxhash is installed (a cache key needs no cryptographic strength), else blake2b.
+    """
+    try:
+        import xxhash
+    except ImportError:
+        import hashlib
+
+        h = hashlib.blake2b(digest_size=16)
+    else:
+        h = xxhash.xxh3_128()
+    for i, part in enumerate(parts):
+        if i:
+            h.update(b"\0")
+        h.update(part.encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+def _cache_connect():
+    """sqlite3 connection to _CACHE_DB, creating the cache table if needed."""
+    import sqlite3
+
+    conn = sqlite3.connect(_CACHE_DB, timeout=10)
+    conn.execute("CREATE TABLE IF NOT EXISTS cache(key TEXT PRIMARY KEY, answer TEXT)")
+    return conn
+
+
+def _cache_get(key: str) -> str | None:
+    """Cached answer for key, or None (also if the cache cannot be read)."""
+    import sqlite3
+    from contextlib import closing
+
+    try:
+        with closing(_cache_connect()) as conn:
+            row = conn.execute("SELECT answer FROM cache WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def _cache_put(key: str, answer: str) -> None:
+    """Store answer under key; cache write failures are ignored."""
+    import sqlite3
+    from contextlib import closing
+
+    try:
+        with closing(_cache_connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO cache(key, answer) VALUES (?, ?)", (key, answer))
+    except sqlite3.Error:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def _client():
+    """
+    Shared OpenAI client: one connection pool reused by every call in this process.
+    With the h2 package installed, concurrent requests (several questions, map-reduce chunks,
+    embedding batches) are multiplexed over one HTTP/2 connection instead of one TLS connection each.
+    """
+    from openai import DefaultHttpxClient, OpenAI
+
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        http_client = None
+    else:
+        http_client = DefaultHttpxClient(http2=True)
+    return OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), http_client=http_client)
 
 
 def extract_meta_openai(
     document_text: str, model: str = "gpt-4o-mini"
 ) -> dict[str, str | None]:
     """Ask OpenAI to extract title, date-time, and 1-sentence summary. Returns dict with title, date_time, summary."""
-    from openai import OpenAI
-
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-    system = (
-        "You are a precise assistant. Extract metadata from the document. "
-        "Return ONLY a valid JSON object with exactly these keys (use null if not found): "
-        '"title" (document title), "date_time" (document date/time as found in the text), '
-        '"summary" (exactly one short sentence summarizing the document). No other text.'
-    )
-    user_content = f"Document:\n\n{document_text[:30000]}\n\n---\n\nReturn the JSON object only."
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user_content},
-        ],
-    )
-    raw = (response.choices[0].message.content or "").strip()
-    # Handle optional markdown code fence
-    if raw.startswith("```"):
-        raw = raw.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
-    try:
-        out = json.loads(raw)
-        return {
-            "title": out.get("title") if out.get("title") else None,
-            "date_time": out.get("date_time") if out.get("date_time") else None,
-            "summary": out.get("summary") if out.get("summary") else None,
-        }
-    except json.JSONDecodeError:
-        return {"title": None, "date_time": None, "summary": raw[:500] if raw else None}
-
-
-def ask_openai(document_text: str, question: str, model: str = "gpt-4o-mini") -> str:
-    """Send document + question to OpenAI Chat Completions; return assistant reply."""
-    from openai import OpenAI
-
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-    system = (
-        "You are a helpful assistant. Answer the user's question based only on the provided document. "
-        "If the document does not contain enough information, say so. Keep answers concise."
-    )
-    user_content = f"Document:\n\n{document_text}\n\n---\n\nQuestion: {question}"
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user_content},
-        ],
-    )
-    return response.choices[0].message.content or ""
+    client = _client()
+    excerpt = _truncate_tokens(document_text, _META_MAX_TOKENS, model)
+    user_content = f"Document:\n\n{excerpt}\n\n---\n\nReturn the JSON object only."
+    with _API_SLOTS:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": _META_SYSTEM},
+                {"role": "user", "content": user_content},
+            ],
+            # JSON mode: the reply is always a valid JSON object (no code fences to strip)
+            response_format={"type": "json_object"},
+        )
+    out = _loads(response.choices[0].message.content or "{}")
+    return {
+        "title": out.get("title") or None,
+        "date_time": out.get("date_time") or None,
+        "summary": out.get("summary") or None,
+    }
 
 
-def main() -> None:
+def ask_openai(
+    document_text: str,
+    question: str,
+    model: str = "gpt-4o-mini",
+    cache: bool = True,
+    stream: bool = False,
+) -> str:
+    """
+    Send document + question to OpenAI Chat Completions; return assistant reply.
+    With cache, answers are looked up in / stored to _CACHE_DB first.
+    With stream, the reply is also written to stdout as it arrives (no trailing newline).
+    """
+    doc_key = _doc_hash(document_text)
+    key = _doc_hash(doc_key, question, model) if cache else None
+    if key is not None:
+        hit = _cache_get(key)
+        if hit is not None:
+            if stream:
+                sys.stdout.write(hit)
+                sys.stdout.flush()
+            return hit
+    client = _client()
+    # [system, document] is a byte-identical prefix across questions on the same document, so
+    # OpenAI's prompt caching can reuse it; prompt_cache_key routes those calls together
+    # A streamed response holds its slot until it has been read to the end
+    with _API_SLOTS:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": _ASK_SYSTEM},
+                # Content parts: the document goes out as its own part, never copied into a larger str
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": "Document:\n\n"},
+                        {"type": "text", "text": document_text},
+                    ],
+                },
+                {"role": "user", "content": f"Question: {question}"},
+            ],
+            prompt_cache_key=doc_key,
+            stream=stream,
+        )
+        if stream:
+            parts = []
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    sys.stdout.write(delta)
+                    sys.stdout.flush()
+                    parts.append(delta)
+            answer = "".join(parts)
+        else:
+            answer = response.choices[0].message.content or ""
+    if key is not None and answer:
+        _cache_put(key, answer)
+    return answer
+
+
+def ask_openai_map_reduce(
+    document_text: str,
+    question: str,
+    model: str = "gpt-4o-mini",
+    cache: bool = True,
+    stream: bool = False,
+    tokens: list[int] | None = None,
+) -> str:
+    """
+    Answer a long document chunk by chunk (concurrently), then combine the partial answers
+    with one more call. Documents under _MAP_REDUCE_THRESHOLD tokens go through ask_openai as-is.
+    With stream, only the final (combined) answer is streamed.
+    tokens: document_text already encoded with _encode, shared across questions.
+    """
+    if _count_tokens(document_text, model, tokens) <= _MAP_REDUCE_THRESHOLD:
+        return ask_openai(document_text, question, model, cache, stream)
+    from concurrent.futures import ThreadPoolExecutor
+
+    chunks = _split_tokens(document_text, _CHUNK_TOKENS, _CHUNK_OVERLAP, model, tokens)
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        partials = list(ex.map(lambda c: ask_openai(c, question, model, cache), chunks))
+    return ask_openai("\n---\n".join(partials), question, model, cache, stream)
+
+
+def _embed(texts: list[str]):
+    """Unit-length float32 embeddings, one row per text; batches are requested concurrently."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    import numpy as np
+
+    client = _client()
+
+    def batch(start: int) -> list[list[float]]:
+        with _API_SLOTS:
+            response = client.embeddings.create(model=_EMBED_MODEL, input=texts[start : start + _EMBED_BATCH])
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        rows = [row for part in ex.map(batch, range(0, len(texts), _EMBED_BATCH)) for row in part]
+    emb = np.asarray(rows, dtype=np.float32)
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb
+
+
+def _load_embeddings(key: str):
+    """(chunks, embeddings) cached under key, or None; the matrix is memory-mapped read-only."""
+    import numpy as np
+
+    npy = _EMBED_CACHE_DIR / f"{key}.npy"
+    try:
+        emb = np.load(npy, mmap_mode="r")
+        chunks = _loads(npy.with_suffix(".json").read_bytes())
+    except (OSError, ValueError):
+        return None
+    if len(chunks) != len(emb):
+        return None
+    return chunks, emb
+
+
+def _save_embeddings(key: str, chunks: list[str], emb) -> None:
+    """Cache chunks and their embeddings under key; write failures are ignored."""
+    import tempfile
+
+    import numpy as np
+
+    npy = _EMBED_CACHE_DIR / f"{key}.npy"
+    try:
+        _EMBED_CACHE_DIR.mkdir(exist_ok=True)
+        # Unique temp names: concurrent writers never share a file. The .npy marks the
+        # entry complete, so it is renamed into place last.
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=_EMBED_CACHE_DIR, suffix=".json", delete=False) as f:
+            f.write(_dumps(chunks))
+        os.replace(f.name, npy.with_suffix(".json"))
+        with tempfile.NamedTemporaryFile(dir=_EMBED_CACHE_DIR, suffix=".npy", delete=False) as f:
+            np.save(f, emb)
+        os.replace(f.name, npy)
+    except OSError:
+        pass
+
+
+def _retrieval_index(
+    document_text: str,
+    model: str = "gpt-4o-mini",
+    chunk_tokens: int = 512,
+    overlap: int = 64,
+    question: str | None = None,
+    tokens: list[int] | None = None,
+):
+    """
+    (chunks, chunk embeddings, question embedding or None) for document_text. Chunks and their
+    embeddings are loaded from _EMBED_CACHE_DIR, or computed (a question rides along as the last
+    input of the same request) and cached. tokens: document_text already encoded with _encode.
+    """
+    extra = [] if question is None else [question]
+    # Chunks and their embeddings depend only on the document and the chunking: cache them
+    key = _doc_hash(document_text, model, _EMBED_MODEL, f"{chunk_tokens}/{overlap}")
+    cached = _load_embeddings(key)
+    if cached is not None:
+        chunks, emb = cached
+        return chunks, emb, (_embed(extra)[0] if extra else None)
+    chunks = _split_tokens(document_text, chunk_tokens, overlap, model, tokens)
+    emb = _embed(chunks + extra)
+    q = None
+    if extra:
+        emb, q = emb[:-1], emb[-1]
+    _save_embeddings(key, chunks, emb)
+    return chunks, emb, q
+
+
+def retrieve(
+    document_text: str,
+    question: str,
+    model: str = "gpt-4o-mini",
+    k: int = 6,
+    chunk_tokens: int = 512,
+    overlap: int = 64,
+    index=None,
+    tokens: list[int] | None = None,
+) -> str:
+    """
+    Return the k chunks of document_text most similar to question (cosine similarity of
+    OpenAI embeddings), in document order and separated by blank lines. Chunk embeddings are
+    cached in _EMBED_CACHE_DIR, so later questions on the same document only embed the question.
+    index: (chunks, embeddings) from _retrieval_index, to share one index across questions.
+    tokens: document_text already encoded with _encode.
+    """
+    import numpy as np
+
+    if index is not None:
+        chunks, emb = index
+        q = _embed([question])[0]
+    else:
+        chunks, emb, q = _retrieval_index(document_text, model, chunk_tokens, overlap, question, tokens)
+    if len(chunks) <= k:
+        return document_text
+    scores = emb @ q
+    # argpartition selects the top k in O(n); sort the indices back into document order
+    top = np.sort(np.argpartition(-scores, k)[:k])
+    return "\n\n".join(chunks[i] for i in top)
+
+
+def ask_openai_retrieve(
+    document_text: str,
+    question: str,
+    model: str = "gpt-4o-mini",
+    cache: bool = True,
+    stream: bool = False,
+    index=None,
+    tokens: list[int] | None = None,
+) -> str:
+    """
+    Like ask_openai, but documents over _RETRIEVE_THRESHOLD tokens are first cut down with retrieve()
+    (using index, when given, instead of loading or building the chunk embeddings).
+    tokens: document_text already encoded with _encode, shared across questions.
+    """
+    if _count_tokens(document_text, model, tokens) > _RETRIEVE_THRESHOLD:
+        document_text = retrieve(document_text, question, model, index=index, tokens=tokens)
+    return ask_openai(document_text, question, model, cache, stream)
+
+
+def _file_key(path: Path, question: str, model: str, mode: str) -> str | None:
+    """Answer-cache key from the file's identity (path, mtime, size) instead of its content; None if stat fails."""
+    try:
+        st = path.stat()
+        resolved = str(path.resolve())
+    except OSError:
+        return None
+    return _doc_hash(resolved, str(st.st_mtime_ns), str(st.st_size), question, model, mode)
+
+
+def _print_answers(questions: list[str], answers: list[str], streamed: bool = False) -> None:
+    """Print a single answer bare (a streamed one is already on stdout), several as Q:/A: blocks."""
+    if len(answers) == 1:
+        # A streamed reply is already on stdout; just end its line
+        print("" if streamed else answers[0])
+        return
+    for n, (q, a) in enumerate(zip(questions, answers)):
+        if n:
+            print()
+        print(f"Q: {q}")
+        print(f"A: {a}")
+
+
+def _build_parser():
+    """CLI parser; argparse is imported here so importing sumai as a module does not load it."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Answer a question based on a text document (OpenAI API).",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -142,22 +669,60 @@ Examples:
   python sumai.py -i document.txt -q "What is the main conclusion?"
   python sumai.py -i document.txt -e                    # extract title, date, 1-sentence summary
   python sumai.py -i document.txt -e -q "Summarize?"    # meta + question
+  python sumai.py -i document.txt -q "Who?" -q "When?"  # several questions, answered concurrently
+  python sumai.py -i document.txt -Q questions.txt      # one question per line
   python sumai.py -i document.txt -ej                  # extract meta to document.json
   python sumai.py -i document.txt -ejc                 # extract meta to YYYY-mm-dd_Doc-title.json
   python sumai.py -i out.json -q "Summarize page 3" --model gpt-4o
+  python sumai.py -i long.json -q "Key findings?" --map-reduce   # long docs: answer per chunk, then combine
+  python sumai.py -i long.json -q "Who signed it?" --retrieve   # long docs: send only the most relevant passages
+  python sumai.py -i document.txt -q "Who is the author?" --auto-model   # simple questions -> gpt-4.1-nano
+  python sumai.py -i document.txt -q "Summarize?" --no-cache     # always ask the API (skip ~/.sumai_cache.sqlite)
   (Use pdfextract -t out.json to create JSON from a PDF first.)
         """,
     )
     parser.add_argument("-i", "--input", required=True, metavar="FILE", help="Document: .txt or .json (e.g. from pdfextract -t)")
-    parser.add_argument("-q", "--question", metavar="Q", help="Question to answer from the document")
+    parser.add_argument("-q", "--question", metavar="Q", action="append", help="Question to answer from the document (repeat for several)")
+    parser.add_argument("-Q", "--questions-file", dest="questions_file", metavar="FILE", help="Also answer each non-empty line of FILE as a question")
     parser.add_argument("-e", "--extract-meta", dest="extract_meta", action="store_true", help="Extract document title, date-time, and 1-sentence summary (print to stdout)")
     parser.add_argument("-ej", "--extract-json", dest="extract_json", action="store_true", help="Extract meta to JSON file: same dir as input, same stem with .json (e.g. doc.txt -> doc.json)")
     parser.add_argument("-ejc", "--extract-json-canonical", dest="extract_json_canonical", action="store_true", help="Extract meta to JSON with canonical name: YYYY-mm-dd_Document-title.json (words hyphenated)")
     parser.add_argument("--model", default="gpt-4o-mini", help="OpenAI model (default: gpt-4o-mini)")
+    parser.add_argument("--auto-model", dest="auto_model", action="store_true", help=f"Answer short lookup questions (title, date, author, how many) with {_SIMPLE_MODEL}; others use --model")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true", help=f"Do not read or write the answer cache ({_CACHE_DB})")
+    long_doc = parser.add_mutually_exclusive_group()
+    long_doc.add_argument("--map-reduce", dest="map_reduce", action="store_true", help=f"For documents over {_MAP_REDUCE_THRESHOLD} tokens: answer {_CHUNK_TOKENS}-token chunks in parallel, then combine the answers")
+    long_doc.add_argument("--retrieve", action="store_true", help=f"For documents over {_RETRIEVE_THRESHOLD} tokens: send only the passages most similar to the question ({_EMBED_MODEL} embeddings)")
+    return parser
+
+
+def main() -> None:
+    parser = _build_parser()
     args = parser.parse_args()
 
-    if not args.extract_meta and not args.extract_json and not args.extract_json_canonical and not args.question:
-        parser.error("At least one of -e/--extract-meta, -ej/--extract-json, -ejc/--extract-json-canonical, or -q/--question is required.")
+    questions = list(args.question or [])
+    if args.questions_file:
+        try:
+            with open(args.questions_file, encoding="utf-8") as f:
+                questions.extend(line.strip() for line in f if line.strip())
+        except OSError as e:
+            print(f"Error reading questions: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    if not args.extract_meta and not args.extract_json and not args.extract_json_canonical and not questions:
+        parser.error("At least one of -e/--extract-meta, -ej/--extract-json, -ejc/--extract-json-canonical, -q/--question, or -Q/--questions-file is required.")
+
+    want_meta = args.extract_meta or args.extract_json or args.extract_json_canonical
+    models = [_pick_model(q, args.model) if args.auto_model else args.model for q in questions]
+    # Second cache layer keyed by file identity: a warm re-ask is answered without loading the document
+    file_keys: list[str | None] = []
+    if not args.no_cache and not want_meta:
+        mode = "map-reduce" if args.map_reduce else "retrieve" if args.retrieve else "full"
+        file_keys = [_file_key(Path(args.input), q, m, mode) for q, m in zip(questions, models)]
+        hits = [_cache_get(k) if k else None for k in file_keys]
+        if None not in hits:
+            _print_answers(questions, hits)
+            return
 
     if not os.environ.get("OPENAI_API_KEY"):
         print("Error: OPENAI_API_KEY is not set.", file=sys.stderr)
@@ -176,14 +741,56 @@ Examples:
         print("Error: Document is empty.", file=sys.stderr)
         sys.exit(1)
 
+    # Stream a single answer to an interactive terminal, unless meta output goes along with it
+    stream = sys.stdout.isatty() and not want_meta and len(questions) == 1
+    from concurrent.futures import ThreadPoolExecutor
+
     try:
-        if args.extract_meta or args.extract_json or args.extract_json_canonical:
-            meta = extract_meta_openai(doc_text, model=args.model)
+        # Meta extraction and the questions are independent: run the requests concurrently.
+        # Threads over the shared client (each call is network-bound) rather than AsyncOpenAI.
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            fut_meta = ex.submit(extract_meta_openai, doc_text, args.model) if want_meta else None
+            shared = {m: {} for m in models}  # per-model arguments computed once for all questions
+            if args.map_reduce:
+                answer = ask_openai_map_reduce
+            elif args.retrieve:
+                answer = ask_openai_retrieve
+            else:
+                answer = ask_openai
+            if args.map_reduce or args.retrieve:
+                # Tokenize the document once per model, not once per question
+                for m in shared:
+                    tokens = _encode(doc_text, m)
+                    shared[m]["tokens"] = tokens
+                    # Several questions: load or embed the document once here, so the question
+                    # threads only embed their question
+                    if (
+                        args.retrieve
+                        and len(questions) > 1
+                        and _count_tokens(doc_text, m, tokens) > _RETRIEVE_THRESHOLD
+                    ):
+                        shared[m]["index"] = _retrieval_index(doc_text, m, tokens=tokens)[:2]
+            fut_answers = [
+                ex.submit(
+                    answer,
+                    doc_text,
+                    q,
+                    m,
+                    not args.no_cache,
+                    stream,
+                    **shared[m],
+                )
+                for q, m in zip(questions, models)
+            ]
+        if fut_meta is not None:
+            import json
+
+            meta = fut_meta.result()
             if args.extract_meta:
                 print("Title:", meta["title"] or "(none)")
                 print("Date/time:", meta["date_time"] or "(none)")
                 print("Summary:", meta["summary"] or "(none)")
-                if args.question:
+                if questions:
                     print()
             if args.extract_json:
                 inp = Path(args.input).resolve()
@@ -202,9 +809,12 @@ Examples:
                     encoding="utf-8",
                 )
                 print(f"Wrote: {json_path}", file=sys.stderr)
-        if args.question:
-            answer = ask_openai(doc_text, args.question, model=args.model)
-            print(answer)
+        answers = [fut.result() for fut in fut_answers]
+        if answers:
+            _print_answers(questions, answers, stream)
+        for key, answer_text in zip(file_keys, answers):
+            if key and answer_text:
+                _cache_put(key, answer_text)
     except Exception as e:
         print(f"Error calling OpenAI: {e}", file=sys.stderr)
         sys.exit(1)